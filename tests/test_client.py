@@ -0,0 +1,92 @@
+"""Tests for the x402 HTTP client flow."""
+import subprocess
+import sys
+
+import httpx
+import pytest
+
+from x402_harness import PaymentConfig, X402AsyncClient, X402Client
+from x402_harness.verify import verify_payment_header
+
+
+TEST_PRIVATE_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+TEST_RECIPIENT = "0x70997970C51812dc3A010C7d01b50e0d17dc79C8"
+
+CHALLENGE = {
+    "accepts": [{
+        "network": "eip155:8453",
+        "address": TEST_RECIPIENT,
+        "amount": "5000",
+        "scheme": "exact",
+    }]
+}
+
+
+def paywall(request: httpx.Request) -> httpx.Response:
+    """Mock x402 server: 402 without a payment, 200 with a valid one."""
+    header = request.headers.get("X-PAYMENT")
+    if not header:
+        return httpx.Response(402, json=CHALLENGE)
+    result = verify_payment_header(header)
+    if not result["valid"]:
+        return httpx.Response(402, json={"error": result["error"]})
+    return httpx.Response(200, json={"paid_by": result["signer"]})
+
+
+def make_client(handler) -> X402Client:
+    return X402Client(transport=httpx.MockTransport(handler))
+
+
+def test_pay_handles_402_flow():
+    """The client signs the challenge and retries with X-PAYMENT."""
+    config = PaymentConfig(private_key=TEST_PRIVATE_KEY)
+    with make_client(paywall) as client:
+        result = client.pay("https://api.example.com/data", config)
+    assert result.success is True
+    assert result.status_code == 200
+    assert result.response_body == {"paid_by": config.sender_address}
+    assert result.payment_header_sent
+
+
+def test_pay_passes_through_non_402():
+    """Endpoints that don't ask for payment are returned as-is."""
+    with make_client(lambda request: httpx.Response(200, json={"free": True})) as client:
+        result = client.pay("https://api.example.com/free", PaymentConfig(private_key=TEST_PRIVATE_KEY))
+    assert result.success is True
+    assert result.response_body == {"free": True}
+    assert result.payment_header_sent is None
+
+
+def test_pay_reports_transport_errors():
+    """Connection failures become an unsuccessful PaymentResult."""
+    def fail(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    with make_client(fail) as client:
+        result = client.pay("https://api.example.com/data", PaymentConfig(private_key=TEST_PRIVATE_KEY))
+    assert result.success is False
+    assert result.status_code == 0
+    assert "connection refused" in result.error
+
+
+@pytest.mark.asyncio
+async def test_async_pay_many_runs_all_flows():
+    """pay_many completes every flow and preserves input order."""
+    configs = [PaymentConfig(private_key=TEST_PRIVATE_KEY) for _ in range(3)]
+    urls = [f"https://api.example.com/item/{i}" for i in range(3)]
+    async with X402AsyncClient(transport=httpx.MockTransport(paywall)) as client:
+        results = await client.pay_many(zip(urls, configs))
+    assert [r.success for r in results] == [True, True, True]
+    headers = {r.payment_header_sent for r in results}
+    assert len(headers) == 3  # fresh nonce per payment
+
+
+def test_package_import_defers_httpx():
+    """Importing the package for signing alone doesn't pull in httpx."""
+    code = (
+        "import sys, x402_harness\n"
+        "assert 'httpx' not in sys.modules\n"
+        "assert x402_harness.X402Client.__name__ == 'X402Client'\n"
+        "assert 'httpx' in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
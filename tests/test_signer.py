@@ -68,3 +68,205 @@ def test_payment_config_sender_address():
     config = PaymentConfig(private_key=TEST_PRIVATE_KEY, to=TEST_RECIPIENT)
     expected = Account.from_key(TEST_PRIVATE_KEY).address
     assert config.sender_address == expected
+
+
+def test_payment_config_derives_sender_once(monkeypatch):
+    """Key derivation runs once, however often the config is used."""
+    from x402_harness import models
+
+    calls = []
+    real_from_key = models.Account.from_key
+
+    def counting_from_key(key):
+        calls.append(key)
+        return real_from_key(key)
+
+    monkeypatch.setattr(models.Account, "from_key", counting_from_key)
+    config = PaymentConfig(private_key=TEST_PRIVATE_KEY[2:], to=TEST_RECIPIENT)
+    expected = real_from_key(TEST_PRIVATE_KEY).address
+    for _ in range(3):
+        assert config.sender_address == expected
+        assert config.account.address == expected
+        sign_payment(config)
+    assert len(calls) == 1
+
+
+def test_signature_matches_full_typed_data_encoding():
+    """The precomputed EIP-712 path signs the same digest as encode_typed_data."""
+    from eth_account.messages import encode_typed_data
+    from x402_harness.signer import build_eip712_message
+
+    config = PaymentConfig(private_key=TEST_PRIVATE_KEY, to=TEST_RECIPIENT)
+    payload = json.loads(base64.b64decode(sign_payment(config)).decode())
+    auth = payload["payload"]["authorization"]
+    typed_data = build_eip712_message(
+        from_addr=auth["from"],
+        to_addr=auth["to"],
+        amount_raw=int(auth["value"]),
+        nonce=bytes.fromhex(auth["nonce"][2:]),
+        valid_after=int(auth["validAfter"]),
+        valid_before=int(auth["validBefore"]),
+    )
+    recovered = Account.recover_message(
+        encode_typed_data(full_message=typed_data),
+        signature=bytes.fromhex(payload["payload"]["signature"].replace("0x", "")),
+    )
+    assert recovered == config.sender_address
+
+
+def test_nonces_are_unique_across_pool_refills():
+    """Pooled nonces are 32 bytes and never repeat, including across refills."""
+    from x402_harness.signer import _take_nonce
+
+    nonces = [_take_nonce() for _ in range(300)]
+    assert all(len(n) == 32 for n in nonces)
+    assert len(set(nonces)) == len(nonces)
+
+
+def test_verify_payment_header_caches_results():
+    """Repeated verification of a header is served from the cache."""
+    from x402_harness.verify import _verify_cached
+
+    config = PaymentConfig(private_key=TEST_PRIVATE_KEY, to=TEST_RECIPIENT)
+    header = sign_payment(config)
+    first = verify_payment_header(header)
+    hits = _verify_cached.cache_info().hits
+    first["valid"] = False
+    second = verify_payment_header(header)
+    assert _verify_cached.cache_info().hits == hits + 1
+    assert second["valid"] is True
+    assert second["signer"] == config.sender_address
+
+
+def test_tampered_header_is_rejected():
+    """Changing a signed field recovers a different signer."""
+    config = PaymentConfig(private_key=TEST_PRIVATE_KEY, to=TEST_RECIPIENT)
+    payload = json.loads(base64.b64decode(sign_payment(config)).decode())
+    payload["payload"]["authorization"]["value"] = "5000000"
+    tampered = base64.b64encode(json.dumps(payload).encode()).decode()
+    result = verify_payment_header(tampered)
+    assert result["valid"] is False
+    assert result["signer"] != config.sender_address
+
+
+def test_verify_rejects_malformed_header():
+    """Headers that aren't base64 JSON of the right shape fail to decode."""
+    bad = base64.b64encode(json.dumps({"payload": {"signature": 42}}).encode()).decode()
+    result = verify_payment_header(bad)
+    assert result["valid"] is False
+    assert result["error"].startswith("Could not decode header")
+
+
+def test_payment_config_rejects_invalid_key():
+    """A malformed private key fails at construction, not at signing time."""
+    with pytest.raises(ValueError):
+        PaymentConfig(private_key="0xnot-a-key")
+
+
+def test_sign_payments_batch():
+    """Batch signing yields one verifiable header per entry, in order."""
+    from x402_harness import sign_payments_batch
+
+    config = PaymentConfig(private_key=TEST_PRIVATE_KEY)
+    entries = [(TEST_RECIPIENT, 1000), (TEST_RECIPIENT, 2000), (TEST_RECIPIENT, 3000)]
+    headers = sign_payments_batch(config, entries)
+    assert len(set(headers)) == 3
+    for header, (_, amount_raw) in zip(headers, entries):
+        result = verify_payment_header(header)
+        assert result["valid"] is True
+        assert result["to"] == TEST_RECIPIENT
+        assert result["amount_usd"] == amount_raw / 1_000_000
+
+
+def test_amount_usd_conversion_is_exact():
+    """USD amounts convert to raw units without float truncation."""
+    config = PaymentConfig(private_key=TEST_PRIVATE_KEY, to=TEST_RECIPIENT, amount_usd=1.001)
+    payload = json.loads(base64.b64decode(sign_payment(config)).decode())
+    assert payload["payload"]["authorization"]["value"] == "1001000"
+
+
+def test_amount_raw_overrides_amount_usd():
+    """amount_raw takes precedence over amount_usd and the challenge amount."""
+    challenge = {"accepts": [{"network": "eip155:8453", "address": TEST_RECIPIENT, "amount": "5000"}]}
+    config = PaymentConfig(private_key=TEST_PRIVATE_KEY, amount_usd=1.0, amount_raw=1234)
+    payload = json.loads(base64.b64decode(sign_payment(config, challenge)).decode())
+    assert payload["payload"]["authorization"]["value"] == "1234"
+
+
+def test_payment_config_pickle_and_deepcopy():
+    """Configs round-trip through pickle/deepcopy before and after signing."""
+    import copy
+    import pickle
+
+    config = PaymentConfig(private_key=TEST_PRIVATE_KEY, to=TEST_RECIPIENT)
+    for _ in range(2):
+        for clone in (pickle.loads(pickle.dumps(config)), copy.deepcopy(config)):
+            assert clone == config
+            assert clone.sender_address == config.sender_address
+            assert verify_payment_header(sign_payment(clone))["valid"] is True
+        sign_payment(config)
+
+
+def test_payment_config_rederives_on_key_change():
+    """Reassigning private_key updates the sender; bad keys are rejected."""
+    other_key = "0x59c6995e998f97a5a0044966f0945389dc9e86dae88c7a8412f4603b6b78690d"
+    config = PaymentConfig(private_key=TEST_PRIVATE_KEY, to=TEST_RECIPIENT)
+    config.private_key = other_key
+    assert config.sender_address == Account.from_key(other_key).address
+    result = verify_payment_header(sign_payment(config))
+    assert result["signer"] == config.sender_address
+
+    with pytest.raises(ValueError):
+        config.private_key = "0xnot-a-key"
+    assert config.private_key == other_key
+
+
+def test_build_eip712_message_returns_independent_copies():
+    """Mutating returned typed data doesn't leak into later calls."""
+    from x402_harness.signer import build_eip712_message
+
+    args = (Account.from_key(TEST_PRIVATE_KEY).address, TEST_RECIPIENT, 5000, b"\x00" * 32, 0, 1)
+    tampered = build_eip712_message(*args)
+    tampered["domain"]["chainId"] = 1
+    tampered["types"]["TransferWithAuthorization"].pop()
+    fresh = build_eip712_message(*args)
+    assert fresh["domain"]["chainId"] == 8453
+    assert len(fresh["types"]["TransferWithAuthorization"]) == 6
+
+
+def test_domain_separator_matches_eth_account():
+    """The hand-computed domain separator equals eth_account's encoding."""
+    from eth_account.messages import encode_typed_data
+    from x402_harness._eip712 import DOMAIN, DOMAIN_SEPARATOR
+
+    msg = encode_typed_data(domain_data=DOMAIN, message_types={"Empty": []}, message_data={})
+    assert bytes(msg.header) == DOMAIN_SEPARATOR
+
+
+def test_bind_keccak_falls_back_to_public_wrapper(monkeypatch):
+    """If eth_hash's internal .hasher isn't a usable backend, use the wrapper."""
+    from x402_harness import _eip712
+
+    real = _eip712._eth_hash_keccak
+
+    class NoHasher:
+        def __call__(self, data):
+            return real(data)
+
+    class SelfBoundHasher(NoHasher):
+        def hasher(self, data):  # like an unresolved _hasher_first_run
+            return real(data)
+
+    for stub in (NoHasher(), SelfBoundHasher()):
+        monkeypatch.setattr(_eip712, "_eth_hash_keccak", stub)
+        assert _eip712._bind_keccak() is stub
+
+
+def test_verify_rejects_non_hex_nonce():
+    """A malformed nonce yields an invalid result instead of raising."""
+    config = PaymentConfig(private_key=TEST_PRIVATE_KEY, to=TEST_RECIPIENT)
+    payload = json.loads(base64.b64decode(sign_payment(config)).decode())
+    payload["payload"]["authorization"]["nonce"] = "zz"
+    result = verify_payment_header(base64.b64encode(json.dumps(payload).encode()).decode())
+    assert result["valid"] is False
+    assert result["error"]
@@ -1,7 +1,31 @@
 """x402 Payment Harness — EOA-based test harness for x402 payments."""
-from .signer import sign_payment
-from .client import X402Client
+import importlib.util
+import os
+
+# eth_hash picks pycryptodome by default, which is much slower than pysha3
+# for the short keccak inputs in EIP-712 hashing. Prefer pysha3 when the
+# "fast" extra is installed; this must run before anything hashes.
+if importlib.util.find_spec("sha3") is not None:
+    os.environ.setdefault("ETH_HASH_BACKEND", "pysha3")
+
+from .signer import sign_payment, sign_payments_batch
 from .models import PaymentConfig, PaymentResult
 
-__all__ = ["sign_payment", "X402Client", "PaymentConfig", "PaymentResult"]
+__all__ = [
+    "sign_payment",
+    "sign_payments_batch",
+    "X402Client",
+    "X402AsyncClient",
+    "PaymentConfig",
+    "PaymentResult",
+]
 __version__ = "1.0.0"
+
+
+def __getattr__(name):
+    # httpx is slow to import and only needed for the HTTP flow, so load
+    # the clients on first access rather than for every sign_payment user.
+    if name in ("X402Client", "X402AsyncClient"):
+        from . import client
+        return getattr(client, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
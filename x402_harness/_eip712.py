@@ -0,0 +1,78 @@
+"""Shared EIP-712 constants and digest for USDC TransferWithAuthorization.
+
+Both the signer and the local verifier hash through this module, so the
+domain they sign over cannot drift apart.
+"""
+from typing import Any, Dict
+
+from eth_abi import encode
+from eth_hash.auto import keccak as _eth_hash_keccak
+
+_KECCAK_EMPTY = bytes.fromhex("c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470")
+
+
+def _bind_keccak():
+    """Return eth_hash's resolved backend keccak256, or the public wrapper.
+
+    eth_utils.keccak and eth_hash's Keccak256 wrapper re-validate input
+    types on every call, but every preimage here is already bytes. After
+    its first call the wrapper exposes the backend function as .hasher;
+    that is an eth_hash internal, so only use it if it checks out.
+    """
+    _eth_hash_keccak(b"")  # resolves the backend
+    hasher = getattr(_eth_hash_keccak, "hasher", None)
+    if (
+        callable(hasher)
+        and getattr(hasher, "__self__", None) is not _eth_hash_keccak
+        and hasher(b"") == _KECCAK_EMPTY
+    ):
+        return hasher
+    return _eth_hash_keccak
+
+
+keccak = _bind_keccak()
+
+# USDC contract on Base mainnet
+USDC_CONTRACT = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
+BASE_CHAIN_ID = 8453
+
+DOMAIN: Dict[str, Any] = {
+    "name": "USD Coin",
+    "version": "2",
+    "chainId": BASE_CHAIN_ID,
+    "verifyingContract": USDC_CONTRACT,
+}
+# The domain never changes, so hash it once instead of on every signature.
+DOMAIN_SEPARATOR: bytes = keccak(encode(
+    ["bytes32", "bytes32", "bytes32", "uint256", "address"],
+    [
+        keccak(b"EIP712Domain(string name,string version,uint256 chainId,address verifyingContract)"),
+        keccak(DOMAIN["name"].encode()),
+        keccak(DOMAIN["version"].encode()),
+        BASE_CHAIN_ID,
+        USDC_CONTRACT,
+    ],
+))
+# keccak256 of the canonical TransferWithAuthorization type string
+TYPE_HASH: bytes = keccak(
+    b"TransferWithAuthorization(address from,address to,uint256 value,"
+    b"uint256 validAfter,uint256 validBefore,bytes32 nonce)"
+)
+_STRUCT_TYPES = ["bytes32", "address", "address", "uint256", "uint256", "uint256", "bytes32"]
+_DIGEST_PREFIX = b"\x19\x01" + DOMAIN_SEPARATOR
+
+
+def compute_digest(
+    from_addr: str,
+    to_addr: str,
+    value: int,
+    valid_after: int,
+    valid_before: int,
+    nonce: bytes,
+) -> bytes:
+    """EIP-712 digest: keccak256(0x1901 || domainSeparator || hashStruct(message))."""
+    struct_hash = keccak(encode(
+        _STRUCT_TYPES,
+        [TYPE_HASH, from_addr, to_addr, value, valid_after, valid_before, nonce],
+    ))
+    return keccak(_DIGEST_PREFIX + struct_hash)
@@ -10,7 +10,6 @@ import json
 import os
 import sys
 
-from .client import X402Client
 from .models import PaymentConfig
 
 
@@ -58,12 +57,18 @@ Examples:
     else:
         private_key = args.key
 
-    config = PaymentConfig(
-        private_key=private_key,
-        to=args.to,
-        amount_usd=args.amount,
-        network=args.network,
-    )
+    try:
+        config = PaymentConfig(
+            private_key=private_key,
+            to=args.to,
+            amount_usd=args.amount,
+            network=args.network,
+        )
+    except ValueError as e:
+        print(f"Error: invalid private key: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    from .client import X402Client  # deferred so --help doesn't import httpx
 
     client = X402Client(timeout=args.timeout)
 
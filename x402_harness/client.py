@@ -4,23 +4,57 @@ Handles the two-step x402 protocol:
   1. Initial request → receives 402 with payment challenge
   2. Signs the challenge with EOA private key
   3. Retries with X-PAYMENT header → receives 200 (or error)
+
+X402AsyncClient runs the same flow on httpx.AsyncClient, for fanning out
+many payments concurrently.
 """
+import asyncio
 import json
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-import requests
+import httpx
 
 from .models import PaymentConfig, PaymentResult
 from .signer import sign_payment
 
 
+USER_AGENT = "x402-payment-harness/1.0.0"
+_HTTP_ERRORS = (httpx.HTTPError, httpx.InvalidURL)
+
+
+def _json_or_raw(resp: httpx.Response) -> Any:
+    try:
+        return resp.json()
+    except Exception:
+        return {"raw": resp.text}
+
+
 class X402Client:
     """HTTP client that speaks x402 payment protocol."""
 
-    def __init__(self, timeout: int = 30):
+    def __init__(self, timeout: int = 30, transport: Optional[httpx.BaseTransport] = None):
         self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": "x402-payment-harness/1.0.0"})
+        # One pooled HTTP/2 connection per origin lets the paid retry reuse
+        # the probe's connection and HPACK-compress the X-PAYMENT header.
+        # A custom transport (e.g. httpx.MockTransport in tests) replaces it.
+        self.session = httpx.Client(
+            http2=True,
+            headers={"User-Agent": USER_AGENT},
+            timeout=timeout,
+            limits=httpx.Limits(max_keepalive_connections=10),
+            follow_redirects=True,
+            transport=transport,
+        )
+
+    def __enter__(self) -> "X402Client":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying connection pool."""
+        self.session.close()
 
     def pay(
         self,
@@ -47,19 +81,15 @@ class X402Client:
                 json=json_body,
                 timeout=self.timeout,
             )
-        except requests.RequestException as e:
+        except _HTTP_ERRORS as e:
             return PaymentResult(success=False, status_code=0, error=str(e))
 
         if resp.status_code != 402:
             # Already accessible or error
-            try:
-                body = resp.json()
-            except Exception:
-                body = {"raw": resp.text}
             return PaymentResult(
                 success=resp.status_code < 400,
                 status_code=resp.status_code,
-                response_body=body,
+                response_body=_json_or_raw(resp),
             )
 
         # Step 2: parse the 402 challenge
@@ -92,7 +122,7 @@ class X402Client:
                 headers={"X-PAYMENT": payment_header},
                 timeout=self.timeout,
             )
-        except requests.RequestException as e:
+        except _HTTP_ERRORS as e:
             return PaymentResult(
                 success=False,
                 status_code=0,
@@ -100,14 +130,124 @@ class X402Client:
                 error=str(e),
             )
 
+        return PaymentResult(
+            success=paid_resp.status_code < 400,
+            status_code=paid_resp.status_code,
+            response_body=_json_or_raw(paid_resp),
+            payment_header_sent=payment_header,
+        )
+
+
+class X402AsyncClient:
+    """Async HTTP client that speaks x402 payment protocol.
+
+    Signing is offloaded to a worker thread so concurrent flows started
+    with pay_many() don't block the event loop on secp256k1.
+    """
+
+    def __init__(self, timeout: int = 30, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.timeout = timeout
+        self.session = httpx.AsyncClient(
+            http2=True,
+            headers={"User-Agent": USER_AGENT},
+            timeout=timeout,
+            limits=httpx.Limits(max_keepalive_connections=10),
+            follow_redirects=True,
+            transport=transport,
+        )
+
+    async def __aenter__(self) -> "X402AsyncClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        await self.session.aclose()
+
+    async def pay(
+        self,
+        url: str,
+        config: PaymentConfig,
+        method: str = "GET",
+        params: Optional[Dict] = None,
+        json_body: Optional[Dict] = None,
+    ) -> PaymentResult:
+        """
+        Make an x402 payment to a URL (async version of X402Client.pay).
+
+        Returns:
+            PaymentResult with success status and response details
+        """
+        # Step 1: probe the endpoint
         try:
-            body = paid_resp.json()
+            resp = await self.session.request(method, url, params=params, json=json_body)
+        except _HTTP_ERRORS as e:
+            return PaymentResult(success=False, status_code=0, error=str(e))
+
+        if resp.status_code != 402:
+            return PaymentResult(
+                success=resp.status_code < 400,
+                status_code=resp.status_code,
+                response_body=_json_or_raw(resp),
+            )
+
+        # Step 2: parse the 402 challenge
+        try:
+            challenge = resp.json()
         except Exception:
-            body = {"raw": paid_resp.text}
+            return PaymentResult(
+                success=False,
+                status_code=402,
+                error=f"Could not parse 402 challenge: {resp.text[:500]}",
+            )
+
+        # Step 3: sign the payment off the event loop
+        try:
+            payment_header = await asyncio.to_thread(sign_payment, config, challenge)
+        except Exception as e:
+            return PaymentResult(
+                success=False,
+                status_code=402,
+                error=f"Payment signing failed: {e}",
+            )
+
+        # Step 4: retry with payment header
+        try:
+            paid_resp = await self.session.request(
+                method,
+                url,
+                params=params,
+                json=json_body,
+                headers={"X-PAYMENT": payment_header},
+            )
+        except _HTTP_ERRORS as e:
+            return PaymentResult(
+                success=False,
+                status_code=0,
+                payment_header_sent=payment_header,
+                error=str(e),
+            )
 
         return PaymentResult(
             success=paid_resp.status_code < 400,
             status_code=paid_resp.status_code,
-            response_body=body,
+            response_body=_json_or_raw(paid_resp),
             payment_header_sent=payment_header,
         )
+
+    async def pay_many(
+        self,
+        targets: Iterable[Tuple[str, PaymentConfig]],
+        method: str = "GET",
+    ) -> List[PaymentResult]:
+        """
+        Run x402 flows for several (url, config) pairs concurrently.
+
+        Returns:
+            PaymentResults in the same order as targets
+        """
+        return list(await asyncio.gather(
+            *(self.pay(url, config, method=method) for url, config in targets)
+        ))
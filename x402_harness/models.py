@@ -1,22 +1,77 @@
 """Data models for x402 payment harness."""
 from dataclasses import dataclass, field
 from typing import Optional
+from coincurve import PrivateKey
 from eth_account import Account
+from eth_account.signers.local import LocalAccount
 
 
 @dataclass
 class PaymentConfig:
-    """Configuration for an x402 payment."""
+    """Configuration for an x402 payment.
+
+    Setting private_key (in __init__ or later) parses the key and derives
+    the sender address immediately, so an invalid key raises ValueError
+    and the derived state never goes stale.
+    """
     private_key: str          # EOA private key (hex, with or without 0x prefix)
     to: Optional[str] = None  # Recipient address (overrides server challenge)
     amount_usd: Optional[float] = None  # Amount in USD (overrides server challenge)
     network: str = "eip155:8453"        # Base mainnet
+    amount_raw: Optional[int] = None    # Amount in raw USDC units (overrides amount_usd)
+
+    def __setattr__(self, name, value):
+        if name == "private_key":
+            # Derive before assigning so a bad key leaves the config unchanged.
+            key_bytes = bytes.fromhex(value[2:] if value.startswith("0x") else value)
+            account = Account.from_key(key_bytes)
+            sender_address = account.address
+            super().__setattr__("_key_bytes", key_bytes)
+            super().__setattr__("_account", account)
+            self.__dict__.pop("_signing_key", None)  # stale for the new key
+            super().__setattr__("_sender_address", sender_address)
+            # Per-config constant part of the X-PAYMENT payload (x402 version 1).
+            # The network is fixed because signatures use the Base USDC domain.
+            super().__setattr__("_payload_template", {
+                "x402Version": 1,
+                "scheme": "exact",
+                "network": "eip155:8453",
+                "payload": {"authorization": {"from": sender_address}},
+            })
+        super().__setattr__(name, value)
+
+    # Derived objects that can't be pickled; rebuilt lazily after unpickling.
+    _UNPICKLED = ("_account", "_signing_key")
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in self._UNPICKLED:
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+    @property
+    def account(self) -> LocalAccount:
+        """eth_account signing account for the private key (derived once)."""
+        account = self.__dict__.get("_account")
+        if account is None:
+            account = self._account = Account.from_key(self._key_bytes)
+        return account
+
+    @property
+    def signing_key(self) -> PrivateKey:
+        """libsecp256k1 key used to sign EIP-712 digests directly (built once)."""
+        signing_key = self.__dict__.get("_signing_key")
+        if signing_key is None:
+            signing_key = self._signing_key = PrivateKey(self._key_bytes)
+        return signing_key
 
     @property
     def sender_address(self) -> str:
-        """Derive sender address from private key."""
-        key = self.private_key if self.private_key.startswith("0x") else f"0x{self.private_key}"
-        return Account.from_key(key).address
+        """Sender address derived from the private key."""
+        return self._sender_address
 
 
 @dataclass
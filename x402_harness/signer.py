@@ -1,23 +1,64 @@
 """EIP-712 TransferWithAuthorization signer for x402 payments.
 
-No CDP dependency — pure eth_account signing.
+No CDP dependency — EIP-712 digests are signed locally with libsecp256k1.
 Implements USDC's EIP-3009 TransferWithAuthorization for Base mainnet.
 """
-import base64
 import json
-import secrets
+import os
+import threading
 import time
-from typing import Any, Dict
-
-from eth_account import Account
-from eth_account.messages import encode_typed_data
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Tuple
 
+from ._eip712 import BASE_CHAIN_ID, USDC_CONTRACT, compute_digest
 from .models import PaymentConfig
 
-# USDC contract on Base mainnet
-USDC_CONTRACT = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
+try:
+    import pybase64 as base64
+except ImportError:  # stdlib fallback; the "fast" extra installs pybase64
+    import base64
+
+try:
+    from orjson import dumps as _json_dumps
+except ImportError:  # stdlib fallback; the "fast" extra installs orjson
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
 USDC_DECIMALS = 6
-BASE_CHAIN_ID = 8453
+_USDC_SCALE = 10 ** USDC_DECIMALS  # 1_000_000 raw units per USD
+
+_NONCE_SIZE = 32
+_NONCE_POOL_SIZE = 4096  # 128 nonces per os.urandom() call
+
+
+class _NoncePool(threading.local):
+    """Per-thread buffer of CSPRNG bytes, sliced into bytes32 nonces."""
+    buf: bytes = b""
+    off: int = 0
+
+
+_nonce_pool = _NoncePool()
+
+
+def _reset_nonce_pool() -> None:
+    # A forked child must never hand out nonces buffered by its parent.
+    global _nonce_pool
+    _nonce_pool = _NoncePool()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_nonce_pool)
+
+
+def _take_nonce() -> bytes:
+    """Return a random bytes32 nonce, refilling the pool when exhausted."""
+    pool = _nonce_pool
+    off = pool.off
+    if off + _NONCE_SIZE > len(pool.buf):
+        pool.buf = os.urandom(_NONCE_POOL_SIZE)
+        off = 0
+    pool.off = off + _NONCE_SIZE
+    return pool.buf[off:off + _NONCE_SIZE]
 
 
 def build_eip712_message(
@@ -28,7 +69,11 @@ def build_eip712_message(
     valid_after: int,
     valid_before: int,
 ) -> Dict[str, Any]:
-    """Build the EIP-712 typed data for TransferWithAuthorization."""
+    """Build the EIP-712 typed data for TransferWithAuthorization.
+
+    The result is a fresh structure the caller owns and may modify freely
+    (e.g. to craft invalid-domain test cases).
+    """
     return {
         "types": {
             "EIP712Domain": [
@@ -76,10 +121,6 @@ def sign_payment(config: PaymentConfig, challenge: Dict[str, Any] = None) -> str
     Returns:
         Base64-encoded JSON string for the X-PAYMENT header.
     """
-    key = config.private_key if config.private_key.startswith("0x") else f"0x{config.private_key}"
-    account = Account.from_key(key)
-    from_addr = account.address
-
     # Extract payment params from challenge or config
     if challenge:
         # Find matching accept entry (prefer exact scheme on eip155:8453)
@@ -97,49 +138,90 @@ def sign_payment(config: PaymentConfig, challenge: Dict[str, Any] = None) -> str
         to_addr = config.to or entry.get("address", entry.get("payTo", ""))
         amount_raw = int(entry.get("amount", entry.get("maxAmountRequired", 5000)))
         # In USDC units: 5000 = $0.005, 1000000 = $1.00
-        if config.amount_usd:
-            amount_raw = int(config.amount_usd * (10 ** USDC_DECIMALS))
+        if config.amount_raw is not None:
+            amount_raw = config.amount_raw
+        elif config.amount_usd:
+            amount_raw = _usd_to_raw(config.amount_usd)
     else:
         if not config.to:
             raise ValueError("PaymentConfig.to is required when no challenge is provided")
         to_addr = config.to
-        amount_raw = int((config.amount_usd or 0.005) * (10 ** USDC_DECIMALS))
+        if config.amount_raw is not None:
+            amount_raw = config.amount_raw
+        else:
+            amount_raw = _usd_to_raw(config.amount_usd or 0.005)
+
+    valid_after, valid_before = _validity_window()
+    return _sign_authorization(config, to_addr, amount_raw, valid_after, valid_before)
+
 
-    # Timing
+def sign_payments_batch(
+    config: PaymentConfig,
+    entries: Iterable[Tuple[str, int]],
+) -> List[str]:
+    """
+    Sign many payments from one key and return their X-PAYMENT header values.
+
+    Cheaper than calling sign_payment in a loop: there is no challenge
+    parsing, and the validity window is computed once for the batch.
+    Each payment still gets its own nonce.
+
+    Args:
+        config: PaymentConfig with the signing private key
+        entries: (recipient address, amount in raw USDC units) pairs
+
+    Returns:
+        Base64-encoded X-PAYMENT header values, in the order of entries.
+    """
+    valid_after, valid_before = _validity_window()
+    return [
+        _sign_authorization(config, to_addr, amount_raw, valid_after, valid_before)
+        for to_addr, amount_raw in entries
+    ]
+
+
+def _usd_to_raw(amount_usd: float) -> int:
+    """Convert USD to raw USDC units without binary float error (1.001 -> 1001000)."""
+    return int(Decimal(str(amount_usd)) * _USDC_SCALE)
+
+
+def _validity_window() -> Tuple[int, int]:
     now = int(time.time())
     valid_after = now - 60       # 1 min in past (clock skew tolerance)
     valid_before = now + 3600    # 1 hour validity
+    return valid_after, valid_before
+
 
+def _sign_authorization(
+    config: PaymentConfig,
+    to_addr: str,
+    amount_raw: int,
+    valid_after: int,
+    valid_before: int,
+) -> str:
+    """Sign one TransferWithAuthorization and encode the X-PAYMENT header."""
     # Random nonce (bytes32)
-    nonce = secrets.token_bytes(32)
-
-    # Build and sign EIP-712 message
-    typed_data = build_eip712_message(
-        from_addr=from_addr,
-        to_addr=to_addr,
-        amount_raw=amount_raw,
-        nonce=nonce,
-        valid_after=valid_after,
-        valid_before=valid_before,
+    nonce = _take_nonce()
+
+    # Build and sign the EIP-712 digest (domain separator is precomputed)
+    digest = compute_digest(
+        config.sender_address, to_addr, amount_raw, valid_after, valid_before, nonce
     )
-    msg = encode_typed_data(full_message=typed_data)
-    signed = account.sign_message(msg)
-
-    # Compose x402 payment payload (x402 version 1)
-    payload = {
-        "x402Version": 1,
-        "scheme": "exact",
-        "network": "eip155:8453",
-        "payload": {
-            "signature": signed.signature.hex(),
-            "authorization": {
-                "from": from_addr,
-                "to": to_addr,
-                "value": str(amount_raw),
-                "validAfter": str(valid_after),
-                "validBefore": str(valid_before),
-                "nonce": "0x" + nonce.hex(),
-            },
-        },
+    # coincurve returns r || s || recid; Ethereum expects v = 27 + recid
+    sig = config.signing_key.sign_recoverable(digest, hasher=None)
+    signature = sig[:64] + bytes((sig[64] + 27,))
+
+    # Compose x402 payment payload from the config's prebuilt skeleton
+    template = config._payload_template
+    authorization = template["payload"]["authorization"].copy()
+    authorization["to"] = to_addr
+    authorization["value"] = str(amount_raw)
+    authorization["validAfter"] = str(valid_after)
+    authorization["validBefore"] = str(valid_before)
+    authorization["nonce"] = "0x" + nonce.hex()
+    payload = template.copy()
+    payload["payload"] = {
+        "signature": "0x" + signature.hex(),
+        "authorization": authorization,
     }
-    return base64.b64encode(json.dumps(payload).encode()).decode()
+    return base64.b64encode(_json_dumps(payload)).decode("ascii")
@@ -1,75 +1,94 @@
 """Local signature verification — mirrors server-side logic for testing."""
-import base64
-import json
+import functools
+from typing import Union
 
-from eth_account import Account
-from eth_account.messages import encode_typed_data
+import msgspec
+from coincurve import PublicKey
+from eth_utils import to_checksum_address
 
-USC_CONTRACT = "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"
-BASE_CHAIN_ID = 8453
+from ._eip712 import BASE_CHAIN_ID, USDC_CONTRACT, compute_digest, keccak  # noqa: F401
+
+try:
+    import pybase64 as base64
+except ImportError:  # stdlib fallback; the "fast" extra installs pybase64
+    import base64
+
+
+# Typed view of the X-PAYMENT JSON, decoded in one pass. Missing fields
+# fall back to empty values and fail signature recovery, not decoding.
+class _Authorization(msgspec.Struct):
+    from_: str = msgspec.field(default="", name="from")
+    to: str = ""
+    value: Union[int, str] = 0
+    validAfter: Union[int, str] = 0
+    validBefore: Union[int, str] = 0
+    nonce: str = ""
+
+
+class _Payload(msgspec.Struct):
+    signature: str = ""
+    authorization: _Authorization = msgspec.field(default_factory=_Authorization)
+
+
+class _Header(msgspec.Struct):
+    payload: _Payload = msgspec.field(default_factory=_Payload)
+
+
+_header_decoder = msgspec.json.Decoder(_Header)
+
+
+def _recover_signer(digest: bytes, signature: bytes) -> str:
+    """Recover the checksummed address that signed a 32-byte digest."""
+    if len(signature) != 65:
+        raise ValueError(f"Invalid signature length: {len(signature)}")
+    v = signature[64]
+    recid = v - 27 if v >= 27 else v
+    pubkey = PublicKey.from_signature_and_message(
+        signature[:64] + bytes((recid,)), digest, hasher=None
+    )
+    return to_checksum_address(keccak(pubkey.format(compressed=False)[1:])[-20:])
 
 
 def verify_payment_header(header_value: str) -> dict:
     """Verify an X-PAYMENT header locally."""
+    # Copy so callers can't mutate the cached result.
+    return dict(_verify_cached(header_value))
+
+
+@functools.lru_cache(maxsize=4096)
+def _verify_cached(header_value: str) -> dict:
+    """Decode and recover the signer; results depend only on the header string."""
     try:
-        payload = json.loads(base64.b64decode(header_value).decode())
+        header = _header_decoder.decode(base64.b64decode(header_value))
     except Exception as e:
         return {"valid": False, "error": f"Could not decode header: {e}"}
 
-    auth = payload.get("payload", {}).get("authorization", {})
-    sig = payload.get("payload", {}).get("signature", "")
-
-    nonce_raw = auth.get("nonce", "")
-    if isinstance(nonce_raw, str) and nonce_raw.startswith("0x"):
-        nonce = bytes.fromhex(nonce_raw[2:])
-    else:
-        nonce = bytes.fromhex(nonce_raw) if nonce_raw else b"\x00" * 32
-
-    typed_data = {
-        "types": {
-            "EIP712Domain": [
-                {"name": "name", "type": "string"},
-                {"name": "version", "type": "string"},
-                {"name": "chainId", "type": "uint256"},
-                {"name": "verifyingContract", "type": "address"},
-            ],
-            "TransferWithAuthorization": [
-                {"name": "from", "type": "address"},
-                {"name": "to", "type": "address"},
-                {"name": "value", "type": "uint256"},
-                {"name": "validAfter", "type": "uint256"},
-                {"name": "validBefore", "type": "uint256"},
-                {"name": "nonce", "type": "bytes32"},
-            ],
-        },
-        "domain": {
-            "name": "USD Coin",
-            "version": "2",
-            "chainId": BASE_CHAIN_ID,
-            "verifyingContract": USC_CONTRACT,
-        },
-        "primaryType": "TransferWithAuthorization",
-        "message": {
-            "from": auth.get("from", ""),
-            "to": auth.get("to", ""),
-            "value": int(auth.get("value", 0)),
-            "validAfter": int(auth.get("validAfter", 0)),
-            "validBefore": int(auth.get("validBefore", 0)),
-            "nonce": nonce,
-        },
-    }
+    auth = header.payload.authorization
+    sig = header.payload.signature
 
     try:
-        msg = encode_typed_data(full_message=typed_data)
-        recovered = Account.recover_message(msg, signature=bytes.fromhex(sig.replace("0x", "")))
-        valid = recovered.lower() == auth.get("from", "").lower()
-        amount_usd = int(auth.get("value", 0)) / 1_000_000
+        nonce_raw = auth.nonce
+        if nonce_raw.startswith("0x"):
+            nonce = bytes.fromhex(nonce_raw[2:])
+        else:
+            nonce = bytes.fromhex(nonce_raw) if nonce_raw else b"\x00" * 32
+        digest = compute_digest(
+            auth.from_,
+            auth.to,
+            int(auth.value),
+            int(auth.validAfter),
+            int(auth.validBefore),
+            nonce,
+        )
+        recovered = _recover_signer(digest, bytes.fromhex(sig[2:] if sig.startswith("0x") else sig))
+        valid = recovered.lower() == auth.from_.lower()
+        amount_usd = int(auth.value) / 1_000_000
         return {
             "valid": valid,
             "signer": recovered,
-            "claimed_from": auth.get("from", ""),
+            "claimed_from": auth.from_,
             "amount_usd": amount_usd,
-            "to": auth.get("to", ""),
+            "to": auth.to,
             "error": None if valid else f"Signer mismatch",
         }
     except Exception as e: